@@ -31,8 +31,8 @@ period_range = pl.date_range(
     current_date,
     interval="1mo",
     eager=True,
-).to_list()
-mths_2024 = [str(i)[:7] for i in period_range]
+)
+mths_2024 = period_range.dt.strftime("%Y-%m").to_list()
 
 df_cols = ["month", "town", "resale_price"]
 param_fields = ",".join(df_cols)
@@ -59,14 +59,17 @@ def fetch_hdb_data(period):
 
 
 # Use ThreadPoolExecutor to fetch data in parallel
+frames = [df]
 with ThreadPoolExecutor(max_workers=4) as executor:
     futures = {
         executor.submit(fetch_hdb_data, period): period for period in mths_2024
     }
 
     for future in as_completed(futures):
-        mth_df = future.result()
-        df = pl.concat([df, mth_df], how="vertical_relaxed")
+        frames.append(future.result())
+
+df = pl.concat(frames, how="vertical_relaxed", rechunk=True)
+del frames
 
 # Data Processing for creating charts
 bins = [300000, 500000, 800000, 1000000]
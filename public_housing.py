@@ -1,11 +1,14 @@
-from dash import Dash, html, dcc, Input, Output, callback, State
+from dash import Dash, html, dcc, Input, Output, callback, State, no_update
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import dash_bootstrap_components as dbc
 from datetime import datetime, date
-import plotly.graph_objects as go
+from functools import lru_cache
 import dash_ag_grid as dag
+import plotly.io as pio
 import polars as pl
+from requests.adapters import HTTPAdapter
 import requests
+import hashlib
 import json
 
 table_cols = [
@@ -24,12 +27,13 @@ table_cols = [
 
 # Get current month and recent periods
 current_mth = datetime.now().date().strftime("%Y-%m")
-periods = [
-    str(i)[:7]
-    for i in pl.date_range(
+periods = (
+    pl.date_range(
         datetime(2024, 3, 1), datetime.now(), interval="1mo", eager=True
-    ).to_list()
-]
+    )
+    .dt.strftime("%Y-%m")
+    .to_list()
+)
 
 # Allows for first 10 days of a month to still include 7th month ago data
 recent_periods = periods[-7:] if datetime.now().day <= 10 else periods[-6:]
@@ -50,38 +54,42 @@ param_fields = ",".join(df_cols)
 base_url = "https://data.gov.sg/api/action/datastore_search?resource_id="
 ext_url = "d_8b84c4ee58e3cfc0ece0d773c8ca6abc"
 full_url = base_url + ext_url
-empty_df = pl.DataFrame(schema=df_cols)
+df_schema = {col: pl.String for col in df_cols}
+empty_df = pl.DataFrame(schema=df_schema)
 
 
 # Function to make an API request
-def fetch_hdb_data(period):
+def fetch_hdb_data(period, session):
     params = {
         "fields": param_fields,
         "filters": json.dumps({"month": period}),
         "limit": 10000,
     }
     result = empty_df
-    response = requests.get(full_url, params=params)
+    response = session.get(full_url, params=params)
     if response.status_code == 200:
-        table_result = pl.DataFrame(
-            response.json().get("result").get("records")
-        )
-        if table_result.columns != []:
-            result = table_result
+        records = response.json().get("result").get("records")
+        result = pl.from_dicts(records, schema=df_schema, strict=False)
     return result
 
 
-# Use ThreadPoolExecutor to fetch data in parallel
-df = empty_df
-with ThreadPoolExecutor(max_workers=4) as executor:
-    futures = {
-        executor.submit(fetch_hdb_data, period): period
-        for period in recent_periods
-    }
+# Use ThreadPoolExecutor to fetch data in parallel over pooled connections
+frames = [empty_df]
+with requests.Session() as session:
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+    session.mount("https://", adapter)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            executor.submit(fetch_hdb_data, period, session): period
+            for period in recent_periods
+        }
 
-    for future in as_completed(futures):
-        mth_df = future.result()
-        df = pl.concat([df, mth_df], how="vertical_relaxed")
+        for future in as_completed(futures):
+            frames.append(future.result())
+
+df = pl.concat(frames, how="vertical_relaxed", rechunk=True)
+del frames
 
 # Data Processing
 df.columns = [
@@ -97,47 +105,66 @@ df.columns = [
 ]
 
 yr, mth = datetime.now().year, datetime.now().month
-selected_mths = pl.date_range(
-    date(2024, 1, 1), date(yr, mth, 1), "1mo", eager=True
-).to_list()
-selected_mths = [i.strftime("%Y-%m") for i in selected_mths[-int(6) :]]
+selected_mths = (
+    pl.date_range(date(2024, 1, 1), date(yr, mth, 1), "1mo", eager=True)
+    .dt.strftime("%Y-%m")
+    .alias("month")
+    .tail(6)
+)
+_selected_mths_by_n = {n: selected_mths.tail(n) for n in (3, 6)}
+
+# Typed literal keeps derived area and price columns in Float32
+sqft_per_sqm = pl.lit(10.7639, dtype=pl.Float32)
 
 df = (
-    df.filter(pl.col("month").is_in(selected_mths))
+    df.lazy()
+    .filter(pl.col("month").is_in(selected_mths))
+    .with_columns(
+        pl.col("area_sqm").cast(pl.Float32),
+        pl.col("price").cast(pl.Float32),
+    )
     .with_columns(
         [
-            pl.col("area_sqm").cast(pl.Float32),
-            pl.col("price").cast(pl.Float32),
-            (pl.col("area_sqm").cast(pl.Float32) * 10.7639).alias("area_sqft"),
-            (
-                pl.col("price").cast(pl.Float32)
-                / pl.col("area_sqm").cast(pl.Float32)
-            ).alias("price_sqm"),
-            (
-                pl.col("price").cast(pl.Float32)
-                / (pl.col("area_sqm").cast(pl.Float32) * 10.7639)
-            ).alias("price_sqft"),
+            (pl.col("area_sqm") * sqft_per_sqm).alias("area_sqft"),
+            (pl.col("price") / pl.col("area_sqm")).alias("price_sqm"),
+            (pl.col("price") / (pl.col("area_sqm") * sqft_per_sqm)).alias(
+                "price_sqft"
+            ),
             ("BLK " + pl.col("block") + " " + pl.col("street")).alias(
                 "street_name"
             ),
             pl.col("lease_mths")
-            .str.replace("s", "")
-            .str.replace(" year", "y")
-            .str.replace(" month", "m")
+            .str.replace_many([" year", " month", "s"], ["y", "m", ""])
             .alias("lease"),
             pl.col("flat")
-            .str.replace(" ROOM", "RM")
-            .str.replace("EXECUTIVE", "EC")
-            .str.replace("MULTI-GENERATION", "MG")
+            .str.replace_many(
+                [" ROOM", "EXECUTIVE", "MULTI-GENERATION"], ["RM", "EC", "MG"]
+            )
             .alias("flat"),
-            pl.col("floor").str.replace(" TO ", "-").alias("floor"),
+            pl.col("floor")
+            .str.replace(" TO ", "-", literal=True)
+            .alias("floor"),
         ]
     )
     .select(table_cols)
+    .with_columns(
+        pl.col("lease")
+        .str.extract(r"^(\d+)y", 1)
+        .cast(pl.Int32)
+        .alias("year_count")
+    )
+    .collect(streaming=True)
 )
 
 print("Completed data extraction from data.gov.sg")
 
+# Server-side cache, so callbacks only pass a selection digest around
+_CACHE: dict[str, pl.DataFrame] = {"main": df}
+
+# Filtered row indices by digest, shared by every session in this process
+_SELECTIONS: dict[str, pl.Series] = {}
+_MAX_SELECTIONS = 64
+
 # Initalise App
 app = Dash(
     __name__,
@@ -182,6 +209,7 @@ area_max = df.select("area_sqft").max().rows()[0][0]
 area_min = df.select("area_sqft").min().rows()[0][0]
 
 legend = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0.5)
+chart_template = pio.templates[pio.templates.default].to_plotly_json()
 chart_width, chart_height = 680, 550
 
 
@@ -196,6 +224,11 @@ def convert_price_area(price_type, area_type):
 
 def grid_format(table: pl.DataFrame):
     """Add custom formatting to AGrid Table Outputs"""
+    return _grid_format_cached(tuple(table.columns))
+
+
+@lru_cache(maxsize=8)
+def _grid_format_cached(cols: tuple):
     output = [
         {"field": "month", "sortable": True, "width": 100, "maxWidth": 100},
         {"field": "flat", "sortable": True, "width": 70, "maxWidth": 70},
@@ -213,7 +246,7 @@ def grid_format(table: pl.DataFrame):
             },
         },
     ]
-    for col in table.columns:
+    for col in cols:
         if "price_" in col:
             output.append(
                 {
@@ -255,98 +288,85 @@ def df_filter(
     min_lease,
     max_lease,
     street,
-    selected_mths,
-    data_json,
 ):
-    """Filter Polars DataFrame for Viz, based on inputs"""
-    df = pl.DataFrame(json.loads(data_json)).lazy()
+    """Return row indices of the cached DataFrame that match the inputs"""
+    df = _CACHE["main"].lazy()
+    price_type = convert_price_area(price_type, area_type)
 
-    # Conditional flags
-    flags = []
+    # Predicates are combined into a single filter
+    preds = [pl.col("flat").is_in(pl.Series("flat", flat, dtype=pl.String))]
 
-    df = df.with_columns(
-        pl.col("lease")
-        .str.split("y")
-        .list.get(0)
-        .cast(pl.Int32)
-        .alias("year_count")
-    )
+    if month:
+        preds.append(pl.col("month").is_in(_selected_mths_by_n[int(month)]))
 
     if max_lease:
-        flags.append(
-            pl.when(pl.col("year_count") >= int(max_lease))
-            .then(True)
-            .otherwise(False)
-            .alias("max_lease_flag")
-        )
+        preds.append(pl.col("year_count") >= int(max_lease))
 
     if min_lease:
-        flags.append(
-            pl.when(pl.col("year_count") <= int(min_lease))
-            .then(True)
-            .otherwise(False)
-            .alias("min_lease_flag")
-        )
-
-    flags.append(
-        pl.when(pl.col("flat").is_in(flat))
-        .then(True)
-        .otherwise(False)
-        .alias("flat_flag")
-    )
+        preds.append(pl.col("year_count") <= int(min_lease))
 
     if street:
-        flags.append(
-            pl.when(pl.col("street").str.contains(street.upper()))
-            .then(True)
-            .otherwise(False)
-            .alias("street_flag")
-        )
-
-    # Conditional flags for town, price, and area
+        # "|" separated streets are trimmed and blanks dropped on both paths
+        streets = [i.strip() for i in street.upper().split("|") if i.strip()]
+        if any(char in street for char in "[].*+?()\\^$"):
+            preds.append(pl.col("street").str.contains("|".join(streets)))
+        elif streets:
+            # Plain text, so streets use one literal scan
+            preds.append(pl.col("street").str.contains_any(streets))
+
+    # Conditional predicates for town, price, and area
     if town != "All":
-        flags.append(
-            pl.when(pl.col("town") == town)
-            .then(True)
-            .otherwise(False)
-            .alias("town_flag")
-        )
+        preds.append(pl.col("town") == town)
 
     if max_price:
-        flags.append(
-            pl.when(pl.col(price_type) <= max_price)
-            .then(True)
-            .otherwise(False)
-            .alias("max_price_flag")
-        )
+        preds.append(pl.col(price_type) <= max_price)
 
     if min_price:
-        flags.append(
-            pl.when(pl.col(price_type) >= min_price)
-            .then(True)
-            .otherwise(False)
-            .alias("min_price_flag")
-        )
+        preds.append(pl.col(price_type) >= min_price)
 
     if max_area:
-        flags.append(
-            pl.when(pl.col(area_type) <= max_area)
-            .then(True)
-            .otherwise(False)
-            .alias("max_area_flag")
-        )
+        preds.append(pl.col(area_type) <= max_area)
 
     if min_area:
-        flags.append(
-            pl.when(pl.col(area_type) >= min_area)
-            .then(True)
-            .otherwise(False)
-            .alias("min_area_flag")
-        )
+        preds.append(pl.col(area_type) >= min_area)
+
+    return (
+        df.with_row_index("idx")
+        .filter(pl.all_horizontal(preds))
+        .select("idx")
+        .collect()
+        .to_series()
+    )
 
-    # Filter and rounding for price and area columns
-    price_type = convert_price_area(price_type, area_type)
 
+def store_selection(idx: pl.Series):
+    """Keep filtered row indices on the server and return their digest"""
+    version = hashlib.blake2b(
+        idx.to_numpy().tobytes(), digest_size=8
+    ).hexdigest()
+
+    # Re-insert so recently used selections are evicted last
+    _SELECTIONS.pop(version, None)
+    _SELECTIONS[version] = idx
+    while len(_SELECTIONS) > _MAX_SELECTIONS:
+        del _SELECTIONS[next(iter(_SELECTIONS))]
+    return version
+
+
+def selection_version(data):
+    """Digest of the filtered-data payload, empty if unknown to the server"""
+    version = (data or {}).get("version", "")
+    return version if version in _SELECTIONS else ""
+
+
+def split_selected(data, area_type):
+    """Split cached DataFrame into selected rows and the rest of SG"""
+    return _split_selected_cached(selection_version(data), area_type)
+
+
+# maxsize is shared by every session, so concurrent users evict each other
+@lru_cache(maxsize=4)
+def _split_selected_cached(version: str, area_type):
     if area_type == "area_sqft":
         rd_col = [
             pl.col("price").round(2),
@@ -362,16 +382,33 @@ def df_filter(
         ]
         drop_columns = ["price_sqft", "area_sqft"]
 
-    return df.with_columns(rd_col + flags).drop(drop_columns).collect()
+    df = _CACHE["main"].with_columns(rd_col).drop(drop_columns)
+    idx = _SELECTIONS.get(version, pl.Series("idx", [], dtype=pl.UInt32))
+    selected = pl.int_range(pl.len(), dtype=pl.UInt32).is_in(idx)
+    return df.filter(selected), df.filter(~selected)
+
+
+@lru_cache(maxsize=4)
+def sorted_selected(version: str, area_type, sort_key: tuple):
+    """Selected rows for the table, sorted by (column, direction) pairs"""
+    df, _ = _split_selected_cached(version, area_type)
+    df = df.drop("year_count")
+
+    # Sort model can still name the other area unit's columns until the
+    # grid picks up the new columnDefs, so ignore columns not in the frame
+    sort_key = tuple(
+        (col, sort) for col, sort in sort_key if col in df.columns
+    )
+    if sort_key:
+        df = df.sort(
+            [col for col, _ in sort_key],
+            descending=[sort == "desc" for _, sort in sort_key],
+        )
+    return df
 
 
 app.layout = html.Div(
     [
-        html.Div(
-            id="data-store",
-            style={"display": "none"},
-            children=df.write_json(),
-        ),
         dcc.Store(id="filtered-data"),
         html.H3(
             children="These are Homes, Truly",
@@ -789,12 +826,13 @@ app.layout = html.Div(
                                         dag.AgGrid(
                                             id="price-table",
                                             columnDefs=grid_format(df),
-                                            rowData=df.to_dicts(),
+                                            rowModelType="infinite",
                                             className="ag-theme-balham",
                                             columnSize="responsiveSizeToFit",
                                             dashGridOptions={
                                                 "pagination": True,
                                                 "paginationAutoPageSize": True,
+                                                "cacheBlockSize": 100,
                                             },
                                         ),
                                     ],
@@ -870,7 +908,6 @@ added_state = [
     State("max_price", "value"),
     State("min_price", "value"),
     State("street", "value"),
-    State("data-store", "children"),
 ]
 full_state = basic_state + added_state
 
@@ -894,9 +931,8 @@ def filtered_data(
     max_price,
     min_price,
     street,
-    data_json,
 ):
-    return df_filter(
+    idx = df_filter(
         month,
         town,
         flat,
@@ -909,13 +945,16 @@ def filtered_data(
         max_lease,
         min_lease,
         street,
-        selected_mths,
-        data_json,
-    ).to_dicts()
+    )
+
+    version = store_selection(idx)
+
+    # Warm the split before the output callbacks fire in parallel for it
+    _split_selected_cached(version, area_type)
+    return {"version": version, "area_type": area_type}
 
 
 @callback(
-    Output("price-table", "rowData"),
     Output("price-table", "columnDefs"),
     Input("filtered-data", "data"),
     State("area_type", "value"),
@@ -923,16 +962,42 @@ def filtered_data(
 )
 def update_table(data, area_type, price_type):
     """Table output to show all searched transactions"""
-    output = [{}]
-    df = pl.DataFrame(data).drop("year_count")
-    if df is not None:
-        flags = [i for i in df.columns if "flag" in i]
-        for flag in flags:
-            df = df.filter(pl.col(flag))
-        df = df.drop(flags)
-        output = df.to_dicts()
-        columnDefs = grid_format(df)
-    return output, columnDefs
+    df, _ = split_selected(data, area_type)
+    return grid_format(df.drop("year_count"))
+
+
+# Drop cached row blocks so the table fetches rows for the new search
+app.clientside_callback(
+    """
+    function (data) {
+        dash_ag_grid.getApiAsync("price-table").then(
+            (api) => api.purgeInfiniteCache()
+        );
+    }
+    """,
+    Input("filtered-data", "data"),
+)
+
+
+@callback(
+    Output("price-table", "getRowsResponse"),
+    Input("price-table", "getRowsRequest"),
+    State("filtered-data", "data"),
+)
+def update_table_rows(request, data):
+    """Serve a block of searched transactions to the table"""
+    if request is None:
+        return no_update
+
+    area_type = (data or {}).get("area_type", "area_sqft")
+    sort_key = tuple(
+        (col["colId"], col["sort"]) for col in request.get("sortModel") or []
+    )
+    df = sorted_selected(selection_version(data), area_type, sort_key)
+
+    start, end = request["startRow"], request["endRow"]
+    rows = df.slice(start, end - start).to_dicts()
+    return {"rowData": rows, "rowCount": df.height}
 
 
 @callback(
@@ -943,28 +1008,21 @@ def update_table(data, area_type, price_type):
 def update_text(data, town, area_type, price_type, max_lease, min_lease):
     """Summary text for searched output"""
 
-    df = pl.DataFrame(data)
-    flags = [i for i in df.columns if "flag" in i]
-    for flag in flags:
-        df = df.filter(pl.col(flag))
-    df = df.drop(flags)
+    df, _ = split_selected(data, area_type)
 
     text = "<b><< YOUR SEARCH HAS NO RESULTS >></b>"
     records = df.shape[0]
     if records > 0:
-        area_min = min(df.select(area_type).to_series())
-        area_max = max(df.select(area_type).to_series())
-
-        if price_type == "price":
-            price_min = min(df.select(price_type).to_series())
-            price_max = max(df.select(price_type).to_series())
-            price_label = "price"
+        price_col = convert_price_area(price_type, area_type)
+        price_label = (
+            "price"
+            if price_col == "price"
+            else f"Price / {area_type.split('_')[-1]}"
+        )
 
-        else:
-            price_type = "price_" + area_type.split("_")[-1]
-            price_min = min(df.select(price_type).to_series())
-            price_max = max(df.select(price_type).to_series())
-            price_label = f"Price / {area_type.split('_')[-1]}"
+        p, a = df[price_col], df[area_type]
+        price_min, price_max = p.min(), p.max()
+        area_min, area_max = a.min(), a.max()
 
         text = f"""<b>You searched : </b>
         <b>Town</b>: {town} |
@@ -988,142 +1046,114 @@ def update_text(data, town, area_type, price_type, max_lease, min_lease):
 @callback(Output("g0", "figure"), Input("filtered-data", "data"), basic_state)
 def update_g0(data, town, area_type, price_type, max_lease, min_lease):
     """Scatter Plot of Price to Price / Sq Area"""
-    fig = go.Figure()
-    df = pl.DataFrame(data)
-
-    if df is not None:
-        flags = [i for i in df.columns if "flag" in i]
-
-        non_df = pl.DataFrame()
-        for flag in flags:
-            non_df = pl.concat([non_df, df.filter(~pl.col(flag))])
-
-        for flag in flags:
-            df = df.filter(pl.col(flag))
-        df = df.drop(flags)
-
-        price_type = convert_price_area(price_type, area_type)
-        price_label = "price_sqm" if area_type == "area_sqm" else "price_sqft"
-
-        base_cols = ["year_count", "town", "street", area_type]
-        customdata_set = list(df[base_cols].to_numpy())
-
-        fig.add_trace(
-            go.Scattergl(
-                y=non_df.select("price").to_series(),
-                x=non_df.select(price_label).to_series(),
-                mode="markers",
-                hoverinfo="skip",
-                marker={"color": "#FFC0BD", "opacity": 0.5},
-                name="Rest of SG",
-            )
-        )
-        fig.add_trace(
-            go.Scattergl(
-                y=df.select("price").to_series(),
-                x=df.select(price_label).to_series(),
-                customdata=customdata_set,
-                hovertemplate="<i>Price:</i> %{y:$,}<br>"
-                + "<i>Area:</i> %{customdata[3]:,}<br>"
-                + "<i>Price/Area:</i> %{x:$,}<br>"
-                + "<i>Town :</i> %{customdata[1]}<br>"
-                + "<i>Street Name:</i> %{customdata[2]}<br>"
-                + "<i>Lease Left:</i> %{customdata[0]}",
-                mode="markers",
-                marker={"color": "rgb(220, 38, 38)", "opacity": 0.9},
-                name="Selected Data",
-            )
-        )
-        fig.update_layout(
-            title="<b>Home Prices vs Price / Area<b>",
-            yaxis={
-                "title": "price",
-                "gridcolor": "#d3d3d3",
-                "showspikes": True,
-            },
-            xaxis={
-                "title": f"{price_label}",
-                "gridcolor": "#d3d3d3",
-                "showspikes": True,
-            },
-            width=chart_width,
-            height=chart_height,
-            legend=legend,
-            plot_bgcolor="white",
-            margin=dict(l=5, r=5),
-        )
-    return fig
+    df, non_df = split_selected(data, area_type)
+
+    price_label = "price_sqm" if area_type == "area_sqm" else "price_sqft"
+    base_cols = ["year_count", "town", "street", area_type]
+    customdata = df.select(base_cols).to_numpy()
+
+    rest_trace = {
+        "type": "scattergl",
+        "y": non_df["price"].to_numpy(),
+        "x": non_df[price_label].to_numpy(),
+        "mode": "markers",
+        "hoverinfo": "skip",
+        "marker": {"color": "#FFC0BD", "opacity": 0.5},
+        "name": "Rest of SG",
+    }
+    selected_trace = {
+        "type": "scattergl",
+        "y": df["price"].to_numpy(),
+        "x": df[price_label].to_numpy(),
+        "customdata": customdata,
+        "hovertemplate": "<i>Price:</i> %{y:$,}<br>"
+        + "<i>Area:</i> %{customdata[3]:,}<br>"
+        + "<i>Price/Area:</i> %{x:$,}<br>"
+        + "<i>Town :</i> %{customdata[1]}<br>"
+        + "<i>Street Name:</i> %{customdata[2]}<br>"
+        + "<i>Lease Left:</i> %{customdata[0]}",
+        "mode": "markers",
+        "marker": {"color": "rgb(220, 38, 38)", "opacity": 0.9},
+        "name": "Selected Data",
+    }
+    layout = {
+        "title": {"text": "<b>Home Prices vs Price / Area<b>"},
+        "yaxis": {
+            "title": {"text": "price"},
+            "gridcolor": "#d3d3d3",
+            "showspikes": True,
+        },
+        "xaxis": {
+            "title": {"text": f"{price_label}"},
+            "gridcolor": "#d3d3d3",
+            "showspikes": True,
+        },
+        "width": chart_width,
+        "height": chart_height,
+        "legend": legend,
+        "plot_bgcolor": "white",
+        "margin": dict(l=5, r=5),
+        "template": chart_template,
+    }
+    return {"data": [rest_trace, selected_trace], "layout": layout}
 
 
 @callback(Output("g2", "figure"), Input("filtered-data", "data"), basic_state)
 def update_g2(data, town, area_type, price_type, max_lease, min_lease):
     """Price to Lease Left Plot"""
-    fig = go.Figure()
-    df = pl.DataFrame(data)
-
-    if df is not None:
-        flags = [i for i in df.columns if "flag" in i]
-        non_df = pl.DataFrame()
-        for flag in flags:
-            non_df = pl.concat([non_df, df.filter(~pl.col(flag))])
-
-        for flag in flags:
-            df = df.filter(pl.col(flag))
-        df = df.drop(flags)
-
-        # Transform user inputs into table usable columns
-        price_type = convert_price_area(price_type, area_type)
-
-        price_label = "price_sqm" if area_type == "area_sqm" else "price_sqft"
-        base_cols = ["price", price_label, "town", "street", area_type]
-        customdata_set = list(df[base_cols].to_numpy())
-
-        fig.add_trace(
-            go.Scattergl(
-                y=non_df.select(price_type).to_series(),  # unchanged
-                x=non_df.select("year_count").to_series(),
-                mode="markers",
-                hoverinfo="skip",
-                marker={"color": "#FFC0BD", "opacity": 0.5},
-                name="Rest of SG",
-            )
-        )
+    df, non_df = split_selected(data, area_type)
 
-        fig.add_trace(
-            go.Scattergl(
-                y=df.select(price_type).to_series(),  # unchanged
-                x=df.select("year_count").to_series(),
-                customdata=customdata_set,
-                hovertemplate="<i>Price:</i> %{customdata[0]:$,}<br>"
-                + "<i>Area:</i> %{customdata[4]:,}<br>"
-                + "<i>Price/Area:</i> %{customdata[1]:$,}<br>"
-                + "<i>Town :</i> %{customdata[2]}<br>"
-                + "<i>Street Name:</i> %{customdata[3]}<br>"
-                + "<i>Lease Left:</i> %{x}",
-                mode="markers",
-                marker={"color": "rgb(220, 38, 38)", "opacity": 0.9},
-                name="Selected Data",
-            )
-        )
-        fig.update_layout(
-            title="<b>Home Prices vs Lease Left<b>",
-            yaxis={
-                "title": f"{price_type}",
-                "gridcolor": "#d3d3d3",
-                "showspikes": True,
-            },
-            xaxis={
-                "title": "lease",
-                "gridcolor": "#d3d3d3",
-                "showspikes": True,
-            },
-            width=chart_width,
-            height=chart_height,
-            legend=legend,
-            plot_bgcolor="white",
-            margin=dict(l=5, r=5),
-        )
-    return fig
+    # Transform user inputs into table usable columns
+    price_type = convert_price_area(price_type, area_type)
+
+    price_label = "price_sqm" if area_type == "area_sqm" else "price_sqft"
+    base_cols = ["price", price_label, "town", "street", area_type]
+    customdata = df.select(base_cols).to_numpy()
+
+    rest_trace = {
+        "type": "scattergl",
+        "y": non_df[price_type].to_numpy(),
+        "x": non_df["year_count"].to_numpy(),
+        "mode": "markers",
+        "hoverinfo": "skip",
+        "marker": {"color": "#FFC0BD", "opacity": 0.5},
+        "name": "Rest of SG",
+    }
+    selected_trace = {
+        "type": "scattergl",
+        "y": df[price_type].to_numpy(),
+        "x": df["year_count"].to_numpy(),
+        "customdata": customdata,
+        "hovertemplate": "<i>Price:</i> %{customdata[0]:$,}<br>"
+        + "<i>Area:</i> %{customdata[4]:,}<br>"
+        + "<i>Price/Area:</i> %{customdata[1]:$,}<br>"
+        + "<i>Town :</i> %{customdata[2]}<br>"
+        + "<i>Street Name:</i> %{customdata[3]}<br>"
+        + "<i>Lease Left:</i> %{x}",
+        "mode": "markers",
+        "marker": {"color": "rgb(220, 38, 38)", "opacity": 0.9},
+        "name": "Selected Data",
+    }
+    layout = {
+        "title": {"text": "<b>Home Prices vs Lease Left<b>"},
+        "yaxis": {
+            "title": {"text": f"{price_type}"},
+            "gridcolor": "#d3d3d3",
+            "showspikes": True,
+        },
+        "xaxis": {
+            "title": {"text": "lease"},
+            "gridcolor": "#d3d3d3",
+            "showspikes": True,
+        },
+        "width": chart_width,
+        "height": chart_height,
+        "legend": legend,
+        "plot_bgcolor": "white",
+        "margin": dict(l=5, r=5),
+        "template": chart_template,
+    }
+    return {"data": [rest_trace, selected_trace], "layout": layout}
 
 
 @callback(